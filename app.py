@@ -1,6 +1,11 @@
-from flask import Flask, render_template, request, redirect, url_for, send_file
+from flask import Flask, render_template, request, redirect, url_for, send_file, Response, jsonify, stream_with_context, get_template_attribute
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func, case, or_, and_, literal_column
 import os
+import json
+import math
+import queue
+import threading
 import qrcode
 from datetime import datetime, timedelta
 from uuid import uuid4
@@ -52,6 +57,10 @@ class Pracownik(db.Model):
 
 class VerificationLog(db.Model):
     """Model do logowania prób weryfikacji"""
+    # AUTOINCREMENT - SQLite nie używa ponownie id usuniętych logów (kursor strumienia SSE).
+    # Dotyczy tylko nowo tworzonej tabeli; istniejąca baza zachowuje stary schemat.
+    __table_args__ = {'sqlite_autoincrement': True}
+
     id = db.Column(db.Integer, primary_key=True)
     pracownik_id = db.Column(db.Integer, db.ForeignKey('pracownik.id'), nullable=True)
     timestamp = db.Column(db.DateTime, default=datetime.now, nullable=False)
@@ -65,6 +74,26 @@ class VerificationLog(db.Model):
         return f'<Log {self.timestamp} - {self.event_type}>'
 
 
+# Nazwisko = część nazwy po pierwszej spacji. Stałe wstawiamy dosłownie, bo SQLite użyje
+# indeksu na wyrażeniu tylko wtedy, gdy zapytanie zawiera dokładnie to samo wyrażenie
+PRACOWNIK_SURNAME = func.substr(
+    Pracownik.name,
+    func.instr(Pracownik.name, literal_column("' '"), type_=db.Integer) + literal_column('1', db.Integer)
+)
+
+# Indeksy pod wyszukiwanie pracowników (początek imienia, nazwiska lub emaila, bez rozróżniania wielkości liter)
+db.Index('ix_pracownik_name_nocase', Pracownik.name.collate('NOCASE'))
+db.Index('ix_pracownik_surname_nocase', PRACOWNIK_SURNAME.collate('NOCASE'))
+db.Index('ix_pracownik_email_nocase', Pracownik.email.collate('NOCASE'))
+
+
+def ensure_indexes():
+    """Tworzy brakujące indeksy także w istniejącej bazie (create_all dodaje je tylko do nowych tabel)"""
+    for model in (Pracownik, VerificationLog):
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
 # ===== FUNKCJE POMOCNICZE =====
 
 def generate_qr_code(content, filename):
@@ -96,9 +125,221 @@ def log_verification(pracownik_id, event_type, success, qr_code=None, similarity
     )
     db.session.add(log)
     db.session.commit()
+    broadcaster.notify()
     return log
 
 
+# ===== LISTA PRACOWNIKÓW =====
+
+EMPLOYEES_PER_PAGE = 25
+EMPLOYEES_MAX_PER_PAGE = 100
+
+
+def escape_like(value):
+    """Zabezpiecza znaki specjalne wzorca LIKE"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def get_listing_args():
+    """Czyta parametry stronicowania, sortowania i wyszukiwania z żądania"""
+    return {
+        'q': request.args.get('q', '').strip() or None,
+        'sort': request.args.get('sort', 'id'),
+        'dir': 'desc' if request.args.get('dir') == 'desc' else 'asc',
+        'page': max(request.args.get('page', 1, type=int), 1),
+        'per_page': min(max(request.args.get('per_page', EMPLOYEES_PER_PAGE, type=int), 1),
+                        EMPLOYEES_MAX_PER_PAGE),
+    }
+
+
+def redirect_to_dashboard():
+    """Wraca do panelu z zachowaną stroną, sortowaniem i wyszukiwaniem (parametry listy
+    przychodzą w adresie akcji)"""
+    return redirect(url_for('admin_dashboard', **get_listing_args()))
+
+
+def query_employees(q=None, sort='id', dir='asc', page=1, per_page=EMPLOYEES_PER_PAGE):
+    """Zwraca stronę listy pracowników i łączną liczbę wyników.
+
+    Pobieramy tylko potrzebne kolumny - status QR i obecność twarzy liczy SQL,
+    więc zapisane embeddingi nie są wczytywane ani rozpakowywane.
+    """
+    qr_status = case(
+        (Pracownik.qr_filename.is_(None), 'missing'),
+        (Pracownik.qr_expiry_date < datetime.now(), 'expired'),
+        else_='valid'
+    ).label('qr_status')
+    has_face = Pracownik.face_encoding.isnot(None).label('has_face')
+
+    query = db.session.query(
+        Pracownik.id,
+        Pracownik.name,
+        Pracownik.email,
+        Pracownik.qr_filename,
+        Pracownik.qr_expiry_date,
+        qr_status,
+        has_face
+    )
+
+    if q:
+        # Wyszukiwanie po początku imienia, nazwiska lub emaila - korzysta z indeksów NOCASE.
+        # Nazwisko to wyrażenie, a SQLite nie stosuje do wyrażeń optymalizacji LIKE,
+        # więc dla niego szukamy zakresem [fraza, fraza + maks. znak)
+        pattern = escape_like(q) + '%'
+        surname = PRACOWNIK_SURNAME.collate('NOCASE')
+        query = query.filter(or_(
+            Pracownik.name.like(pattern, escape='\\'),
+            Pracownik.email.like(pattern, escape='\\'),
+            and_(surname >= q, surname < q + '\U0010ffff')
+        ))
+
+    total = query.with_entities(func.count(Pracownik.id)).scalar()
+
+    sort_columns = {
+        'id': Pracownik.id,
+        'name': Pracownik.name.collate('NOCASE'),
+        'email': Pracownik.email.collate('NOCASE'),
+        'qr_status': qr_status,
+        'qr_expiry_date': Pracownik.qr_expiry_date,
+    }
+    sort_column = sort_columns.get(sort, Pracownik.id)
+    order = sort_column.desc() if dir == 'desc' else sort_column.asc()
+
+    rows = (query.order_by(order, Pracownik.id)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all())
+    return rows, total
+
+
+def serialize_employee(row):
+    """Zamienia wiersz listy pracowników na słownik dla API"""
+    return {
+        'id': row.id,
+        'name': row.name,
+        'email': row.email,
+        'qr_status': row.qr_status,
+        'qr_expiry_date': row.qr_expiry_date.strftime('%Y-%m-%d') if row.qr_expiry_date else None,
+        'qr_url': url_for('static', filename='qr_codes/' + row.qr_filename) if row.qr_filename else None,
+        'has_face': bool(row.has_face),
+    }
+
+
+# ===== ZDARZENIA NA ŻYWO (SSE) =====
+
+LIVE_POLL_INTERVAL = 1.0    # co ile sekund wątek sprawdza nowe logi
+LIVE_KEEPALIVE = 15         # co ile sekund wysyłamy komentarz podtrzymujący połączenie
+LIVE_CATCHUP_LIMIT = 500    # maks. liczba logów dosyłanych po ponownym połączeniu
+
+
+def get_last_log_id():
+    """Zwraca id najnowszego logu (kursor dla strumienia zdarzeń)"""
+    return db.session.query(func.max(VerificationLog.id)).scalar() or 0
+
+
+def serialize_log(log, pracownik_name):
+    """Zamienia log na słownik wysyłany do przeglądarki, razem ze zmianą liczników"""
+    return {
+        'id': log.id,
+        'timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        'pracownik_id': log.pracownik_id,
+        'pracownik': pracownik_name,
+        'event_type': log.event_type,
+        'success': log.success,
+        'similarity_score': log.similarity_score,
+        'capture_filename': log.capture_filename,
+        'counters': {
+            'total_logs': 1,
+            'successful_entries': 1 if log.event_type == 'FACE_SUCCESS' and log.success else 0,
+            'failed_entries': 0 if log.success else 1,
+        },
+    }
+
+
+def fetch_logs_after(last_id, limit):
+    """Pobiera logi nowsze niż kursor (rosnąco po id) - tanie zapytanie po kluczu głównym"""
+    rows = (db.session.query(VerificationLog, Pracownik.name)
+            .outerjoin(Pracownik, VerificationLog.pracownik_id == Pracownik.id)
+            .filter(VerificationLog.id > last_id)
+            .order_by(VerificationLog.id)
+            .limit(limit)
+            .all())
+    return [serialize_log(log, name) for log, name in rows]
+
+
+def format_sse(event, data, event_id=None):
+    """Formatuje pojedynczą wiadomość w formacie text/event-stream"""
+    message = ''
+    if event_id is not None:
+        message += f'id: {event_id}\n'
+    message += f'event: {event}\ndata: {json.dumps(data)}\n\n'
+    return message
+
+
+class LogBroadcaster:
+    """Jeden wątek śledzi nowe logi i rozsyła je do wszystkich otwartych stron.
+
+    Niezależnie od liczby otwartych paneli baza dostaje jedno zapytanie po kursorze
+    na interwał, i to tylko wtedy, gdy ktoś słucha. Logi zapisuje terminal (osobny proces),
+    więc trafiają do stron przy najbliższym odpytaniu. log_verification w panelu dodatkowo
+    budzi wątek od razu.
+    """
+
+    def __init__(self, poll_interval=LIVE_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.last_id = 0
+        self.thread = None
+
+    def subscribe(self):
+        """Rejestruje nowego słuchacza (wywoływane w kontekście żądania)"""
+        subscriber = queue.Queue()
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if self.thread is None:
+                # Kursor ustawiamy przed catch-upem klienta, więc żaden log nie zginie
+                self.last_id = get_last_log_id()
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def notify(self):
+        """Budzi wątek po zapisaniu nowego logu"""
+        self.wake_event.set()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None
+                    return
+
+            try:
+                with app.app_context():
+                    events = fetch_logs_after(self.last_id, LIVE_CATCHUP_LIMIT)
+            except Exception as e:
+                print(f"✗ Błąd odczytu nowych logów: {e}")
+                events = []
+
+            if events:
+                self.last_id = events[-1]['id']
+                with self.lock:
+                    for subscriber in self.subscribers:
+                        subscriber.put(events)
+
+            self.wake_event.wait(self.poll_interval)
+            self.wake_event.clear()
+
+
+broadcaster = LogBroadcaster()
+
+
 # ===== ROUTES - PANEL ADMINISTRATORA =====
 @app.route('/send_qr_email/<int:employee_id>')
 def send_qr_email(employee_id):
@@ -106,7 +347,7 @@ def send_qr_email(employee_id):
     
     if not employee.email or not employee.qr_filename:
         print("Brak maila lub kodu QR")
-        return redirect(url_for('admin_dashboard'))
+        return redirect_to_dashboard()
 
     try:
         msg = Message(f"Twój kod dostępu - {employee.name}",
@@ -123,23 +364,51 @@ def send_qr_email(employee_id):
     except Exception as e:
         print(f"Błąd wysyłania emaila: {e}")
 
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 @app.route('/')
 def admin_dashboard():
-    """Panel administratora - lista wszystkich pracowników"""
-    wszyscy_pracownicy = Pracownik.query.all()
+    """Panel administratora - stronicowana lista pracowników"""
+    listing = get_listing_args()
+    pracownicy, total_employees = query_employees(**listing)
+    pages = max(math.ceil(total_employees / listing['per_page']), 1)
+
+    # Np. po usunięciu ostatniego pracownika na ostatniej stronie
+    if listing['page'] > pages:
+        return redirect(url_for('admin_dashboard', **dict(listing, page=pages)))
+
+    # Kursor czytamy przed statystykami - log dopisany w międzyczasie dośle strumień SSE
+    last_log_id = get_last_log_id()
+    logs_until_cursor = VerificationLog.query.filter(VerificationLog.id <= last_log_id)
     
     # Statystyki
-    total_logs = VerificationLog.query.count()
-    successful_entries = VerificationLog.query.filter_by(event_type='FACE_SUCCESS', success=True).count()
-    failed_entries = VerificationLog.query.filter_by(success=False).count()
+    total_logs = logs_until_cursor.count()
+    successful_entries = logs_until_cursor.filter_by(event_type='FACE_SUCCESS', success=True).count()
+    failed_entries = logs_until_cursor.filter_by(success=False).count()
     
     return render_template('dashboard.html', 
-                         pracownicy=wszyscy_pracownicy, 
-                         now=datetime.now(),
+                         pracownicy=pracownicy, 
+                         total_employees=total_employees,
+                         pages=pages,
+                         listing=listing,
                          total_logs=total_logs,
                          successful_entries=successful_entries,
-                         failed_entries=failed_entries)
+                         failed_entries=failed_entries,
+                         last_log_id=last_log_id)
+
+
+@app.route('/api/employees')
+def api_employees():
+    """JSON API - stronicowana, sortowana i przeszukiwalna lista pracowników"""
+    listing = get_listing_args()
+    rows, total = query_employees(**listing)
+
+    return jsonify({
+        'items': [serialize_employee(row) for row in rows],
+        'page': listing['page'],
+        'per_page': listing['per_page'],
+        'pages': max(math.ceil(total / listing['per_page']), 1),
+        'total': total,
+    })
 
 
 @app.route('/logs')
@@ -151,11 +420,16 @@ def view_logs():
     date_to = request.args.get('date_to')
     event_type = request.args.get('event_type')
     
-    # Buduj query
-    query = VerificationLog.query
+    # Kursor strumienia SSE czytamy przed listą - nowsze logi dośle strumień
+    last_log_id = get_last_log_id()
+
+    # Buduj query (z nazwą pracownika w tym samym zapytaniu)
+    query = (db.session.query(VerificationLog, Pracownik.name)
+             .outerjoin(Pracownik, VerificationLog.pracownik_id == Pracownik.id)
+             .filter(VerificationLog.id <= last_log_id))
     
     if pracownik_id:
-        query = query.filter_by(pracownik_id=pracownik_id)
+        query = query.filter(VerificationLog.pracownik_id == pracownik_id)
     
     if date_from:
         date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
@@ -166,17 +440,19 @@ def view_logs():
         query = query.filter(VerificationLog.timestamp < date_to_obj)
     
     if event_type:
-        query = query.filter_by(event_type=event_type)
+        query = query.filter(VerificationLog.event_type == event_type)
     
-    # Sortuj od najnowszych
-    logs = query.order_by(VerificationLog.timestamp.desc()).limit(500).all()
+    # Sortuj od najnowszych - wiersze w tym samym kształcie co zdarzenia strumienia SSE
+    logs = [serialize_log(log, name)
+            for log, name in query.order_by(VerificationLog.timestamp.desc()).limit(500).all()]
     
-    # Wszyscy pracownicy dla filtra
-    wszyscy_pracownicy = Pracownik.query.all()
+    # Wszyscy pracownicy dla filtra (bez wczytywania embeddingów)
+    wszyscy_pracownicy = db.session.query(Pracownik.id, Pracownik.name).order_by(Pracownik.name).all()
     
     return render_template('logs.html', 
                          logs=logs, 
                          pracownicy=wszyscy_pracownicy,
+                         last_log_id=last_log_id,
                          filters={
                              'pracownik_id': pracownik_id,
                              'date_from': date_from,
@@ -185,6 +461,62 @@ def view_logs():
                          })
 
 
+@app.route('/events')
+def live_events():
+    """Strumień SSE z nowymi logami weryfikacji i zmianami liczników"""
+    # Przy ponownym połączeniu przeglądarka sama wysyła Last-Event-ID
+    cursor = request.headers.get('Last-Event-ID', type=int)
+    if cursor is None:
+        cursor = request.args.get('since', type=int)
+    if cursor is None:
+        cursor = get_last_log_id()
+    # Historia prosi o gotowe wiersze tabeli, panel potrzebuje tylko liczników
+    with_rows = request.args.get('rows', type=int) == 1
+
+    subscriber = broadcaster.subscribe()
+    backlog = fetch_logs_after(cursor, LIVE_CATCHUP_LIMIT + 1)
+    # Kontekst żądania żyje tyle co strumień - zwalniamy połączenie z bazą (i blokadę SQLite) od razu
+    db.session.close()
+
+    def log_message(event):
+        if with_rows:
+            # To samo makro co tabela w logs.html - znaczniki wiersza są w jednym miejscu
+            event = dict(event, html=str(get_template_attribute('_log_row.html', 'log_row')(event)))
+        return format_sse('log', event, event['id'])
+
+    def stream():
+        try:
+            # Zbyt duża zaległość - taniej przeładować stronę niż dosyłać wszystko
+            if len(backlog) > LIVE_CATCHUP_LIMIT:
+                yield format_sse('reload', {})
+                return
+
+            sent_id = cursor
+            for event in backlog:
+                yield log_message(event)
+                sent_id = event['id']
+
+            while True:
+                try:
+                    events = subscriber.get(timeout=LIVE_KEEPALIVE)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+
+                for event in events:
+                    if event['id'] > sent_id:
+                        yield log_message(event)
+                        sent_id = event['id']
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    # stream_with_context - url_for w makrze wiersza potrzebuje kontekstu żądania
+    response = Response(stream_with_context(stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/download_report')
 def download_report():
     """Pobiera raport w formacie Excel"""
@@ -271,7 +603,7 @@ def add_employee():
     db.session.add(new_employee)
     db.session.commit()
     print(f"✓ Dodano pracownika: {new_name}")
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 
 
 @app.route('/generate_qr/<int:employee_id>')
@@ -290,7 +622,7 @@ def generate_qr(employee_id):
     db.session.commit()
 
     print(f"✓ Wygenerowano QR dla: {employee.name} (ważny do {expiry_date.strftime('%Y-%m-%d')})")
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 
 
 @app.route('/upload_photo/<int:employee_id>', methods=['POST'])
@@ -300,12 +632,12 @@ def upload_photo(employee_id):
     
     if 'photo' not in request.files:
         print("✗ Brak pliku w żądaniu")
-        return redirect(url_for('admin_dashboard'))
+        return redirect_to_dashboard()
     
     file = request.files['photo']
     if file.filename == '':
         print("✗ Nie wybrano pliku")
-        return redirect(url_for('admin_dashboard'))
+        return redirect_to_dashboard()
     
     try:
         temp_path = os.path.join(TEMP_FOLDER, f'temp_{employee_id}.jpg')
@@ -335,7 +667,7 @@ def upload_photo(employee_id):
     except Exception as e:
         print(f"✗ Błąd podczas przetwarzania zdjęcia: {e}")
     
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 
 
 @app.route('/delete/<int:employee_id>')
@@ -353,7 +685,7 @@ def delete_employee(employee_id):
     db.session.commit()
     
     print(f"✗ Usunięto pracownika: {name}")
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 
 
 @app.route('/regenerate_qr/<int:employee_id>')
@@ -377,12 +709,13 @@ def regenerate_qr(employee_id):
     db.session.commit()
     
     print(f"✓ Regenerowano QR dla: {employee.name}")
-    return redirect(url_for('admin_dashboard'))
+    return redirect_to_dashboard()
 
 
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        ensure_indexes()
         print("=" * 50)
         print("PANEL ADMINISTRATORA - System weryfikacji pracowników")
         print("=" * 50)
@@ -390,4 +723,4 @@ if __name__ == '__main__':
         print(f"Liczba logów weryfikacji: {VerificationLog.query.count()}")
         print("Uruchamiam serwer na http://127.0.0.1:5000")
         print("=" * 50)
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)
\ No newline at end of file
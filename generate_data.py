@@ -0,0 +1,224 @@
+"""Generator danych testowych - wypełnia fabryka.db pracownikami i logami weryfikacji.
+
+Przykład:
+    python generate_data.py --employees 5000 --logs 2000000 --days 365 --reset
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app import app, db, ensure_indexes, generate_qr_code, Pracownik, VerificationLog
+
+FIRST_NAMES = ['Jan', 'Anna', 'Piotr', 'Katarzyna', 'Tomasz', 'Agnieszka', 'Paweł', 'Magdalena',
+               'Krzysztof', 'Joanna', 'Michał', 'Monika', 'Marcin', 'Ewa', 'Łukasz', 'Zofia',
+               'Grzegorz', 'Aleksandra', 'Adam', 'Barbara']
+LAST_NAMES = ['Nowak', 'Kowalski', 'Wiśniewski', 'Wójcik', 'Kowalczyk', 'Kamiński', 'Lewandowski',
+              'Zieliński', 'Szymański', 'Woźniak', 'Dąbrowski', 'Kozłowski', 'Jankowski', 'Mazur',
+              'Kwiatkowski', 'Krawczyk', 'Piotrowski', 'Grabowski', 'Nowakowski', 'Pawłowski']
+
+EMBEDDING_SIZE = 512    # Facenet512
+BATCH_SIZE = 20000
+# Wspólny plik QR dla pracowników spoza próbki z prawdziwymi kodami (tylko do podglądu i emaila)
+PLACEHOLDER_QR_FILENAME = 'qr_gen_placeholder.png'
+
+UNKNOWN_QR_RATE = 0.05    # skany kodów spoza bazy (QR_INVALID)
+FACE_FAIL_RATE = 0.15     # szansa na nieudaną próbę twarzy
+MAX_FACE_ATTEMPTS = 3     # jak w terminalu
+NIGHT_TRAFFIC = 0.2       # ruch poza godzinami 6-22 względem ruchu w dzień
+MAX_SESSION_SECONDS = 15  # najdłuższe podejście (3 próby twarzy) - żaden log nie wyjdzie poza "teraz"
+
+
+def random_embedding():
+    """Losowy, znormalizowany wektor o rozmiarze embeddingu Facenet512"""
+    vector = [random.gauss(0, 1) for _ in range(EMBEDDING_SIZE)]
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector]
+
+
+def generate_employees(count, face_ratio, qr_files, now):
+    """Dodaje pracowników - część z wygasłym lub brakującym QR, część bez twarzy.
+
+    Pierwszych qr_files pracowników z kodem dostaje prawdziwy plik QR, reszta wspólny
+    plik zastępczy - linki "(Zobacz)" i wysyłka emaila działają bez generowania tysięcy PNG.
+    """
+    generate_qr_code('placeholder', PLACEHOLDER_QR_FILENAME)
+    rows = []
+    for i in range(count):
+        first = random.choice(FIRST_NAMES)
+        last = random.choice(LAST_NAMES)
+        qr_roll = random.random()
+        has_qr = qr_roll < 0.9
+        qr_content = str(uuid4()) if has_qr else None
+        expiry_date = None
+        if has_qr:
+            # ~15% kodów już wygasło
+            days_left = random.randint(-60, -1) if qr_roll < 0.15 else random.randint(1, 30)
+            expiry_date = now + timedelta(days=days_left)
+
+        qr_filename = None
+        if has_qr and qr_files > 0:
+            qr_files -= 1
+            qr_filename = generate_qr_code(qr_content, f'qr_gen_{qr_content}.png')
+        elif has_qr:
+            qr_filename = PLACEHOLDER_QR_FILENAME
+
+        rows.append({
+            'name': f'{first} {last}',
+            'email': f'{first.lower()}.{last.lower()}.{i}@fabryka.pl',
+            'qr_code_content': qr_content,
+            'qr_filename': qr_filename,
+            'qr_expiry_date': expiry_date,
+            'face_encoding': random_embedding() if random.random() < face_ratio else None,
+        })
+
+        if len(rows) >= BATCH_SIZE // 10:
+            db.session.execute(Pracownik.__table__.insert(), rows)
+            rows = []
+
+    if rows:
+        db.session.execute(Pracownik.__table__.insert(), rows)
+    db.session.commit()
+
+
+def session_events(employees, start):
+    """Zdarzenia jednego podejścia do terminala - zgodne ze stanem pracownika,
+    w tej samej kolejności sprawdzeń co terminal_app.py"""
+    if random.random() < UNKNOWN_QR_RATE:
+        return [(None, start, 'QR_INVALID', False, str(uuid4()), None, None, None)]
+
+    employee_id, qr_code, expiry_date, has_face = random.choice(employees)
+
+    if expiry_date and expiry_date < start:
+        return [(employee_id, start, 'QR_EXPIRED', False, qr_code, None, None, None)]
+    if not has_face:
+        return [(employee_id, start, 'NO_FACE_DATA', False, qr_code, None, None, None)]
+
+    t = start
+    events = [(employee_id, t, 'QR_SUCCESS', True, qr_code, None, None, None)]
+    for attempt in range(1, MAX_FACE_ATTEMPTS + 1):
+        t += timedelta(seconds=random.uniform(1.5, 4.0))
+        if random.random() >= FACE_FAIL_RATE:
+            events.append((employee_id, t, 'FACE_SUCCESS', True, None, random.uniform(0.66, 0.95), None, None))
+            break
+
+        similarity = random.uniform(0.2, 0.64)
+        events.append((employee_id, t, 'FACE_ATTEMPT_FAIL', False, None, similarity, f'Proba {attempt}', None))
+        if attempt == MAX_FACE_ATTEMPTS:
+            capture = f'alert_{int(t.timestamp())}_{employee_id}.jpg'
+            events.append((employee_id, t, 'FACE_FAILED_FINAL', False, None, similarity, None, capture))
+    return events
+
+
+def hour_slots(days, now):
+    """Godzinne przedziały okna [now - days, now] z wagą ruchu (dzień / noc)"""
+    slot_start = now - timedelta(days=days)
+    while slot_start < now:
+        slot_end = min(slot_start + timedelta(hours=1), now)
+        weight = 1.0 if 6 <= slot_start.hour < 22 else NIGHT_TRAFFIC
+        yield slot_start, slot_end, weight * (slot_end - slot_start).total_seconds() / 3600
+        slot_start = slot_end
+
+
+def generate_logs(count, days, now):
+    """Dodaje logi rosnąco w czasie (jak w produkcji), głównie w godzinach zmian.
+
+    Logi rozkładamy na godzinne przedziały okna [now - days, now] proporcjonalnie do wagi
+    przedziału, a w obrębie przedziału sortujemy po czasie.
+    """
+    if count <= 0:
+        return
+
+    # Do terminala podchodzą tylko pracownicy z kodem QR
+    employees = [
+        (row.id, row.qr_code_content, row.qr_expiry_date, row.has_face)
+        for row in db.session.query(
+            Pracownik.id,
+            Pracownik.qr_code_content,
+            Pracownik.qr_expiry_date,
+            Pracownik.face_encoding.isnot(None).label('has_face')
+        ).filter(Pracownik.qr_code_content.isnot(None))
+    ]
+    if not employees:
+        raise SystemExit("Brak pracowników z kodem QR - najpierw wygeneruj pracowników (--employees)")
+
+    slots = list(hour_slots(days, now - timedelta(seconds=MAX_SESSION_SECONDS)))
+    total_weight = sum(weight for _, _, weight in slots)
+    cumulative_weight = 0.0
+    generated = 0
+    written = 0
+    batch = []
+    started = time.time()
+
+    for slot_start, slot_end, weight in slots:
+        cumulative_weight += weight
+        # Cel narastająco - nadwyżka z ostatniego podejścia przedziału wyrównuje się w kolejnych
+        target = round(count * cumulative_weight / total_weight)
+        span = (slot_end - slot_start).total_seconds()
+
+        slot_events = []
+        while generated + len(slot_events) < target:
+            start = slot_start + timedelta(seconds=random.uniform(0, span))
+            slot_events.extend(session_events(employees, start))
+        slot_events.sort(key=lambda event: event[1])
+        generated += len(slot_events)
+
+        for pracownik_id, timestamp, event_type, success, qr_code, similarity, notes, capture in slot_events:
+            batch.append({
+                'pracownik_id': pracownik_id,
+                'timestamp': timestamp,
+                'event_type': event_type,
+                'success': success,
+                'qr_code_used': qr_code,
+                'similarity_score': similarity,
+                'notes': notes,
+                'capture_filename': capture,
+            })
+
+        if len(batch) >= BATCH_SIZE or generated >= count:
+            chunk = batch[:count - written]
+            db.session.execute(VerificationLog.__table__.insert(), chunk)
+            db.session.commit()
+            written += len(chunk)
+            batch = []
+            print(f"  {written}/{count} logów ({written / (time.time() - started):.0f}/s)")
+
+        if written >= count:
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generator danych testowych dla fabryka.db')
+    parser.add_argument('--employees', type=int, default=1000, help='liczba pracowników do dodania')
+    parser.add_argument('--logs', type=int, default=100000, help='liczba logów weryfikacji do dodania')
+    parser.add_argument('--days', type=int, default=90, help='z ilu ostatnich dni generować logi')
+    parser.add_argument('--qr-files', type=int, default=50,
+                        help='ilu pracowników dostaje prawdziwy plik QR (reszta wspólny plik zastępczy)')
+    parser.add_argument('--face-ratio', type=float, default=0.9, help='ułamek pracowników z embeddingiem twarzy')
+    parser.add_argument('--seed', type=int, default=None, help='ziarno generatora (powtarzalne dane)')
+    parser.add_argument('--reset', action='store_true', help='usuń istniejące dane przed generowaniem')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    now = datetime.now()
+
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        db.create_all()
+        ensure_indexes()
+
+        print(f"Dodaję {args.employees} pracowników...")
+        generate_employees(args.employees, args.face_ratio, args.qr_files, now)
+
+        print(f"Dodaję {args.logs} logów z ostatnich {args.days} dni...")
+        generate_logs(args.logs, args.days, now)
+
+        print(f"✓ Pracowników w bazie: {Pracownik.query.count()}")
+        print(f"✓ Logów w bazie: {VerificationLog.query.count()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""Test obciążeniowy tras panelu administratora (lokalnie, przez klienta testowego Flask).
+
+Dla każdej trasy wysyła --requests żądań z --concurrency wątków i raportuje
+przepustowość, percentyle opóźnień oraz szczytowe zużycie pamięci. Ciężkie trasy
+(pełny raport Excel, upload_photo z DeepFace) dostają osobny, mały budżet
+--heavy-requests i jednego klienta naraz.
+
+Przykład:
+    python generate_data.py --employees 5000 --logs 2000000 --reset
+    python load_test.py --requests 200 --concurrency 8 --photo twarz.jpg --output baseline.json
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from app import app, db, Pracownik
+from generate_data import FIRST_NAMES, LAST_NAMES
+
+# Trasy, których jedno żądanie trwa sekundy i zajmuje dużo pamięci
+HEAVY_ROUTES = {'download_report_full', 'upload_photo'}
+# Uruchamiane tylko na wyraźne żądanie (--routes): pełny raport wczytuje wszystkie logi,
+# a powyżej 1 048 576 wierszy (limit arkusza Excel) każde żądanie kończy się błędem 500
+OPT_IN_ROUTES = {'download_report_full'}
+
+
+def percentile(sorted_values, p):
+    """Percentyl metodą najbliższego rzędu"""
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def find_search_terms():
+    """Początki imion i nazwisk z generatora, dla których wyszukiwanie zwraca wyniki"""
+    client = app.test_client()
+    candidates = sorted({name[:3] for name in FIRST_NAMES + LAST_NAMES})
+    return [term for term in candidates
+            if client.get(f'/api/employees?q={term}&per_page=1').get_json()['total'] > 0]
+
+
+def build_scenarios(employee_ids, search_terms, photo):
+    """Trasy do przetestowania: nazwa -> funkcja wysyłająca jedno żądanie"""
+    scenarios = {
+        'admin_dashboard': lambda client: client.get('/'),
+        'api_employees': lambda client: client.get('/api/employees?page=2&per_page=50'),
+        'view_logs': lambda client: client.get('/logs'),
+        'view_logs_filtered': lambda client: client.get(
+            f'/logs?pracownik_id={random.choice(employee_ids)}&event_type=FACE_SUCCESS'),
+        'download_report': lambda client: client.get(
+            f'/download_report?pracownik_id={random.choice(employee_ids)}'),
+        'download_report_full': lambda client: client.get('/download_report'),
+    }
+
+    if search_terms:
+        scenarios['admin_dashboard_search'] = lambda client: client.get(
+            f'/?q={random.choice(search_terms)}&sort=name')
+
+    if photo:
+        with open(photo, 'rb') as f:
+            photo_bytes = f.read()
+        # Uwaga: nadpisuje embedding losowego pracownika w testowej bazie
+        scenarios['upload_photo'] = lambda client: client.post(
+            f'/upload_photo/{random.choice(employee_ids)}',
+            data={'photo': (BytesIO(photo_bytes), 'photo.jpg')},
+            content_type='multipart/form-data')
+
+    return scenarios
+
+
+def timed_request(send):
+    client = app.test_client()
+    start = time.perf_counter()
+    response = send(client)
+    response.get_data()  # czytamy całą odpowiedź (np. plik Excel)
+    return time.perf_counter() - start, response.status_code
+
+
+def run_scenario(send, requests, concurrency):
+    """Wysyła żądania równolegle i zwraca opóźnienia, błędy i całkowity czas"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: timed_request(send), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return latencies, errors, elapsed
+
+
+def measure_peak_memory(send, repeats):
+    """Szczytowa pamięć alokowana przez Pythona podczas obsługi żądania (osobny przebieg,
+    bo tracemalloc spowalnia aplikację i zafałszowałby pomiar opóźnień)"""
+    tracemalloc.start()
+    peak = 0
+    try:
+        for _ in range(repeats):
+            tracemalloc.reset_peak()
+            timed_request(send)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test obciążeniowy tras panelu administratora')
+    parser.add_argument('--requests', type=int, default=100, help='liczba żądań na trasę')
+    parser.add_argument('--concurrency', type=int, default=8, help='liczba równoległych klientów')
+    parser.add_argument('--routes', nargs='*',
+                        help='testuj tylko wybrane trasy (domyślnie wszystkie poza download_report_full)')
+    parser.add_argument('--heavy-requests', type=int, default=3,
+                        help='liczba żądań dla ciężkich tras (wysyłane po jednym)')
+    parser.add_argument('--photo', help='zdjęcie twarzy do testu upload_photo (bez niego trasa jest pomijana)')
+    parser.add_argument('--memory-repeats', type=int, default=3, help='liczba żądań do pomiaru pamięci (0 = bez)')
+    parser.add_argument('--warmup', type=int, default=2, help='żądania rozgrzewające przed pomiarem')
+    parser.add_argument('--output', help='zapisz wyniki do pliku JSON (baza do porównań)')
+    parser.add_argument('--seed', type=int, default=None, help='ziarno losowania pracowników')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    with app.app_context():
+        employee_ids = [row.id for row in db.session.query(Pracownik.id)]
+    if not employee_ids:
+        raise SystemExit("Brak pracowników w bazie - uruchom najpierw generate_data.py")
+
+    search_terms = find_search_terms()
+    if not search_terms:
+        print("Uwaga: żadna fraza z generate_data.py nie daje wyników - pomijam admin_dashboard_search")
+
+    scenarios = build_scenarios(employee_ids, search_terms, args.photo)
+    if args.routes:
+        unknown = set(args.routes) - set(scenarios)
+        if unknown:
+            raise SystemExit(f"Nieznane trasy: {', '.join(sorted(unknown))}")
+        scenarios = {name: scenarios[name] for name in args.routes}
+    else:
+        scenarios = {name: send for name, send in scenarios.items() if name not in OPT_IN_ROUTES}
+
+    print(f"Pracowników w bazie: {len(employee_ids)} | żądań na trasę: {args.requests} | "
+          f"równolegle: {args.concurrency} | ciężkie trasy: {args.heavy_requests} x 1")
+    header = f"{'Trasa':<24}{'req/s':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'błędy':>8}{'pamięć MB':>11}"
+    print(header)
+    print('-' * len(header))
+
+    results = {}
+    for name, send in scenarios.items():
+        heavy = name in HEAVY_ROUTES
+        requests = args.heavy_requests if heavy else args.requests
+        concurrency = 1 if heavy else args.concurrency
+        memory_repeats = min(args.memory_repeats, 1) if heavy else args.memory_repeats
+        if requests <= 0:
+            continue
+
+        if not heavy:
+            for _ in range(args.warmup):
+                timed_request(send)
+
+        latencies, errors, elapsed = run_scenario(send, requests, concurrency)
+        peak_memory = measure_peak_memory(send, memory_repeats) if memory_repeats else None
+
+        results[name] = {
+            'requests': requests,
+            'concurrency': concurrency,
+            'throughput': requests / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p90_ms': percentile(latencies, 90) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'errors': errors,
+            'peak_memory_mb': peak_memory / 1024 / 1024 if peak_memory is not None else None,
+        }
+
+        r = results[name]
+        memory = f"{r['peak_memory_mb']:.1f}" if r['peak_memory_mb'] is not None else '-'
+        print(f"{name:<24}{r['throughput']:>9.1f}{r['p50_ms']:>10.1f}{r['p90_ms']:>10.1f}"
+              f"{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}{errors:>8}{memory:>11}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'employees': len(employee_ids), 'routes': results}, f, indent=2)
+        print(f"✓ Zapisano wyniki do {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -30,6 +30,7 @@ class Pracownik(db.Model):
         return f'<Pracownik {self.name}>'
 
 class VerificationLog(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
     pracownik_id = db.Column(db.Integer, db.ForeignKey('pracownik.id'), nullable=True)
     timestamp = db.Column(db.DateTime, default=datetime.now, nullable=False)
@@ -72,8 +73,78 @@ COLOR_ORANGE = (0, 165, 255) # BGR
 COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0)
 
+
+class MotionDetector:
+    """Tania detekcja ruchu - różnica kolejnych, mocno pomniejszonych klatek w skali szarości"""
+
+    def __init__(self, sensitivity=25, min_area=0.005, size=(64, 36)):
+        self.sensitivity = sensitivity  # min. zmiana jasności piksela (0-255)
+        self.min_area = min_area        # min. ułamek zmienionych pikseli uznawany za ruch
+        self.size = size
+        self.previous = None
+
+    def detect(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        if self.previous is None:
+            self.previous = gray
+            return False
+
+        diff = cv2.absdiff(gray, self.previous)
+        self.previous = gray
+        changed = np.count_nonzero(diff > self.sensitivity) / diff.size
+        return changed >= self.min_area
+
+
+class CpuUsageStats:
+    """Mierzy czas CPU procesu osobno dla każdego trybu pracy terminala"""
+
+    MODES = ("IDLE", "SCANNING", "VERIFYING")
+
+    def __init__(self, report_interval=300):
+        self.report_interval = report_interval
+        self.wall = {mode: 0.0 for mode in self.MODES}
+        self.cpu = {mode: 0.0 for mode in self.MODES}
+        self.last_wall = time.time()
+        self.last_cpu = time.process_time()
+        self.last_report = self.last_wall
+
+    def update(self, mode):
+        """Dolicza czas od poprzedniego wywołania do trybu, w którym była pętla"""
+        now_wall = time.time()
+        now_cpu = time.process_time()
+        self.wall[mode] += now_wall - self.last_wall
+        self.cpu[mode] += now_cpu - self.last_cpu
+        self.last_wall = now_wall
+        self.last_cpu = now_cpu
+
+        if self.report_interval and now_wall - self.last_report > self.report_interval:
+            self.last_report = now_wall
+            self.report()
+
+    def load(self, mode):
+        """Średnie obciążenie w danym trybie (1.0 = jeden rdzeń)"""
+        return self.cpu[mode] / self.wall[mode] if self.wall[mode] > 0 else 0.0
+
+    def report(self):
+        total = sum(self.wall.values())
+        if total <= 0:
+            return
+        idle_load = self.load("IDLE")
+        scanning_load = self.load("SCANNING")
+        idle_share = self.wall["IDLE"] / total
+
+        # Szacunek: tyle CPU zużyłby skaner QR, gdyby działał także w czasie czuwania
+        saved = max(scanning_load - idle_load, 0.0) * self.wall["IDLE"]
+        print(f"CPU: skanowanie {scanning_load:.0%} rdzenia, czuwanie {idle_load:.0%} rdzenia | "
+              f"czuwanie {idle_share:.0%} czasu | zaoszczędzono ~{saved:.0f} s CPU")
+
+
 class TerminalApp:
-    def __init__(self):
+    def __init__(self, motion_sensitivity=25, motion_min_area=0.005, idle_timeout=10,
+                 wake_latency=0.25, cpu_report_interval=300):
         self.cap = cv2.VideoCapture(0)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
@@ -97,6 +168,15 @@ class TerminalApp:
         self.max_face_attempts = 3
         self.current_face_attempt = 0
         self.next_attempt_time = 0 
+
+        # Tryb czuwania - bez ruchu przed kamerą nie skanujemy QR
+        self.motion_detector = MotionDetector(motion_sensitivity, motion_min_area)
+        self.idle = False
+        self.idle_timeout = idle_timeout    # sekundy bez ruchu do przejścia w czuwanie
+        self.wake_latency = wake_latency    # co ile sekund sprawdzamy ruch w czuwaniu
+        self.last_motion_time = time.time()
+        self.next_motion_check = 0
+        self.cpu_stats = CpuUsageStats(cpu_report_interval)
         
     def draw_ui(self, frame):
         height, width = frame.shape[:2]
@@ -123,6 +203,9 @@ class TerminalApp:
         instruction_y = height - 50
         status_text = f"Stan: {self.state}"
         
+        if self.idle:
+            status_text += " | CZUWANIE"
+
         if self.face_verification_running:
             status_text += " | PRZETWARZANIE..."
             cv2.putText(frame, ">>> NIE RUSZAJ SIE <<<", (width//2 - 200, height//2), 
@@ -138,6 +221,24 @@ class TerminalApp:
             cv2.rectangle(frame, (20, 20), (width-20, height-20), COLOR_RED, 15)
         
         return frame
+
+    def current_mode(self):
+        if self.idle:
+            return "IDLE"
+        if self.state == "WAITING_QR":
+            return "SCANNING"
+        return "VERIFYING"
+
+    def update_motion(self, frame, current_time):
+        """Przełącza terminal między czuwaniem a skanowaniem na podstawie ruchu"""
+        if self.motion_detector.detect(frame):
+            self.last_motion_time = current_time
+            if self.idle:
+                self.idle = False
+                print("Wykryto ruch - wybudzam terminal")
+        elif not self.idle and current_time - self.last_motion_time > self.idle_timeout:
+            self.idle = True
+            print("Brak ruchu - przechodzę w tryb czuwania")
     
     def scan_qr(self, frame):
         """Skanuje QR i zwraca obiekt pracownika ODŁĄCZONY od sesji DB"""
@@ -249,13 +350,29 @@ class TerminalApp:
         save_folder = os.path.join('static', 'security_captures')
         os.makedirs(save_folder, exist_ok=True)
         while True:
+            self.cpu_stats.update(self.current_mode())
+
+            # W czuwaniu tylko zdejmujemy klatki z bufora kamery, bez dekodowania
+            if self.idle and time.time() < self.next_motion_check:
+                if not self.cap.grab(): break
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+
             ret, frame = self.cap.read()
             if not ret: break
             frame = cv2.flip(frame, 1)
             current_time = time.time()
             
-            # === STAN 1: CZEKANIE NA QR ===
+            # Detekcja ruchu - bez ruchu przed kamerą nie skanujemy QR
             if self.state == "WAITING_QR":
+                self.update_motion(frame, current_time)
+
+            if self.idle:
+                self.next_motion_check = current_time + self.wake_latency
+
+            # === STAN 1: CZEKANIE NA QR ===
+            elif self.state == "WAITING_QR":
                 employee = self.scan_qr(frame)
                 
                 if employee:
@@ -328,6 +445,7 @@ class TerminalApp:
                     self.message = "Pokaz kod QR"
                     self.message_color = COLOR_WHITE
                     self.current_employee = None
+                    self.last_motion_time = current_time
             
             frame = self.draw_ui(frame)
             cv2.imshow('Terminal', frame)
@@ -337,6 +455,7 @@ class TerminalApp:
         
         self.cap.release()
         cv2.destroyAllWindows()
+        self.cpu_stats.report()
 
 if __name__ == '__main__':
     TerminalApp().run()
\ No newline at end of file